@@ -3,67 +3,261 @@ CAD File Export Utilities
 Handles export to STEP, STL, and DXF formats
 """
 
+import asyncio
+import copy
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+import numpy as np
 from OCC.Core.STEPControl import STEPControl_Writer, STEPControl_AsIs
 from OCC.Core.StlAPI import StlAPI_Writer
 from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.BRepTools import breptools_Write
 from OCC.Core.IFSelect import IFSelect_RetDone
+from OCC.Core.Interface import Interface_Static
 from OCC.Core.Bnd import Bnd_Box
 from OCC.Core.BRepBndLib import brepbndlib_Add
 
+# Process-wide OCCT parallelism: with this set, every BRepAlgoAPI_*
+# boolean and BRepMesh triangulation downstream uses all cores on
+# TBB-enabled builds. Harmless no-op otherwise.
+try:
+    from OCC.Core.BOPAlgo import BOPAlgo_Options
+    BOPAlgo_Options.SetParallelMode_s(True)
+except Exception:
+    pass
 
-def export_step(shape, filename: str) -> bool:
+# Route OCCT signals through C++ exceptions instead of raw signal
+# handlers, which misbehave under Python's own handlers. The ImportError
+# guard covers pythonocc builds without the OSD module.
+try:
+    from OCC.Core.OSD import OSD
+except ImportError:
+    pass
+else:
+    OSD.SetSignal_s(False)
+
+
+class CachedShape:
+    """
+    Lightweight wrapper pairing a TopoDS_Shape with its cached bounding box
+
+    Boolean-heavy generators (e.g. create_bottle) return this so repeated
+    preview/bbox queries cost O(1) after the first. Every exporter accepts
+    either a raw shape or a CachedShape; call invalidate() whenever the
+    wrapped shape is replaced by a new boolean result.
+    """
+    __slots__ = ('shape', '_bbox')
+
+    def __init__(self, shape):
+        self.shape = shape
+        self._bbox = None
+
+    def invalidate(self):
+        """Drop the cached bounding box (after the shape changes)"""
+        self._bbox = None
+
+
+def _unwrap(shape):
+    """Accept either a raw TopoDS_Shape or a CachedShape"""
+    return shape.shape if isinstance(shape, CachedShape) else shape
+
+
+# Directories already created this process; lets the individual exporters
+# stay idempotent without re-running makedirs (and its stat walk) per call
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(filename: str):
+    """
+    Create the file's parent directory if needed
+
+    Known directories are re-checked with a single stat rather than
+    trusted blindly, so one removed between requests (e.g. an artifact
+    cleanup cron while the persistent worker is running) is recreated
+    instead of failing every subsequent export.
+    """
+    dirname = os.path.dirname(filename)
+    if not dirname:
+        return
+    if dirname in _ENSURED_DIRS and os.path.isdir(dirname):
+        return
+    os.makedirs(dirname, exist_ok=True)
+    _ENSURED_DIRS.add(dirname)
+
+
+# The STL writer is stateless between writes and safe to reuse; the STEP
+# writer is deliberately NOT reused. Its work session keeps a transfer
+# map of shapes already transferred, so after Model().Clear() a repeat
+# Transfer() of the same TopoDS_Shape (exactly what the memoized
+# generators hand the persistent worker) adds no entities and Write()
+# silently emits a STEP file with an empty DATA section. A fresh writer
+# per export is trivial next to the Transfer/Write cost and also avoids
+# the session's binder map growing for every distinct shape over a
+# worker's lifetime. _WRITER_LOCK still serializes STEP exports because
+# the Interface_Static settings are process-global.
+_WRITER_LOCK = threading.Lock()
+_STL_WRITER = None
+
+
+def _get_stl_writer():
+    """Get the shared STL writer (stateless between writes)"""
+    global _STL_WRITER
+    with _WRITER_LOCK:
+        if _STL_WRITER is None:
+            _STL_WRITER = StlAPI_Writer()
+            # Binary STL: ~5x smaller files and much faster to write and
+            # re-read than ASCII. Don't flip this back without a reason.
+            _STL_WRITER.SetASCIIMode(False)
+        return _STL_WRITER
+
+
+def _configure_step_output(surface_curve_mode: bool, precision: float):
+    """
+    Apply global STEP interface settings before a Transfer
+
+    Skipping parametric p-curves (surface_curve_mode=False) roughly
+    halves file size for faceted solids and speeds up both the write and
+    downstream re-imports; the curves are only needed by consumers that
+    rely on them for CAM interop.
+    """
+    Interface_Static.SetIVal_s("write.surfacecurve.mode",
+                               1 if surface_curve_mode else 0)
+    Interface_Static.SetIVal_s("write.precision.mode", 1)
+    Interface_Static.SetRVal_s("write.precision.val", precision)
+
+
+def export_step(shape, filename: str, surface_curve_mode: bool = False,
+                precision: float = 0.01) -> bool:
     """
     Export shape to STEP format (ISO 10303-21)
-    
+
     Args:
         shape: OpenCascade shape object
         filename: Output filename
-        
+        surface_curve_mode: Write parametric p-curves (larger files;
+                            only needed for some CAM consumers)
+        precision: Geometry write precision in mm
+
     Returns:
         bool: True if export successful
     """
     try:
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        step_writer = STEPControl_Writer()
-        step_writer.Transfer(shape, STEPControl_AsIs)
-        status = step_writer.Write(filename)
-        
+        _ensure_dir(filename)
+
+        with _WRITER_LOCK:
+            _configure_step_output(surface_curve_mode, precision)
+            # Fresh writer per export - see the note at _WRITER_LOCK
+            step_writer = STEPControl_Writer()
+            step_writer.Transfer(_unwrap(shape), STEPControl_AsIs)
+            status = step_writer.Write(filename)
+
         return status == IFSelect_RetDone
     except Exception as e:
         print(f"Error exporting STEP: {e}")
         return False
 
 
-def export_stl(shape, filename: str, linear_deflection: float = 0.1) -> bool:
+def mesh_shape(shape, linear_deflection: float = 0.1,
+               angular_deflection: float = 0.5) -> bool:
+    """
+    Tessellate a shape, attaching the triangulation to it
+
+    The triangulation stays cached on the TopoDS_Shape, so meshing once
+    up front lets STL export (and any future preview path) skip the most
+    expensive part of the pipeline.
+
+    Args:
+        shape: OpenCascade shape object
+        linear_deflection: Mesh quality (lower = finer mesh)
+        angular_deflection: Angular deflection in radians
+
+    Returns:
+        bool: True if meshing completed
+    """
+    mesh = BRepMesh_IncrementalMesh(
+        _unwrap(shape), linear_deflection, False, angular_deflection, True
+    )
+    mesh.Perform()
+
+    if not mesh.IsDone():
+        print("Warning: Mesh generation may be incomplete")
+
+    return mesh.IsDone()
+
+
+def export_step_bytes(shape, surface_curve_mode: bool = False,
+                      precision: float = 0.01) -> Optional[bytes]:
+    """
+    Export shape to STEP and return the payload as bytes
+
+    Useful for orchestrators that pipe the STEP data to a network or
+    object store: the bytes come back in one call instead of writing a
+    file and reading it again. The data passes through a temp file
+    (pythonocc has no portable in-memory STEP stream), which lands on
+    tmpfs on typical server setups.
+
+    Args:
+        shape: OpenCascade shape object
+
+    Returns:
+        bytes: STEP file contents, or None on failure
+    """
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix=".step")
+        os.close(fd)
+        try:
+            with _WRITER_LOCK:
+                _configure_step_output(surface_curve_mode, precision)
+                # Fresh writer per export - see the note at _WRITER_LOCK
+                step_writer = STEPControl_Writer()
+                step_writer.Transfer(_unwrap(shape), STEPControl_AsIs)
+                status = step_writer.Write(tmp_path)
+
+            if status != IFSelect_RetDone:
+                return None
+
+            with open(tmp_path, 'rb') as f:
+                return f.read()
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    except Exception as e:
+        print(f"Error exporting STEP bytes: {e}")
+        return None
+
+
+def export_stl(shape, filename: str, linear_deflection: float = 0.1,
+               angular_deflection: float = 0.5, mesh: bool = True) -> bool:
     """
     Export shape to STL format for 3D printing
-    
+
     Args:
         shape: OpenCascade shape object
         filename: Output filename
         linear_deflection: Mesh quality (lower = finer mesh)
-        
+        angular_deflection: Angular deflection in radians
+        mesh: Tessellate before writing; pass False when the shape was
+              already meshed (e.g. by export_all_formats)
+
     Returns:
         bool: True if export successful
     """
     try:
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        # Generate mesh
-        mesh = BRepMesh_IncrementalMesh(shape, linear_deflection)
-        mesh.Perform()
-        
-        if not mesh.IsDone():
-            print("Warning: Mesh generation may be incomplete")
-        
+        _ensure_dir(filename)
+
+        if mesh:
+            mesh_shape(shape, linear_deflection, angular_deflection)
+
         # Write STL
-        stl_writer = StlAPI_Writer()
-        stl_writer.Write(shape, filename)
+        stl_writer = _get_stl_writer()
+        stl_writer.Write(_unwrap(shape), filename)
         
         return True
     except Exception as e:
@@ -83,47 +277,93 @@ def export_brep(shape, filename: str) -> bool:
         bool: True if export successful
     """
     try:
-        from OCC.Core.BRepTools import breptools_Write
-        
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        _ensure_dir(filename)
         
-        return breptools_Write(shape, filename)
+        return breptools_Write(_unwrap(shape), filename)
     except Exception as e:
         print(f"Error exporting BREP: {e}")
         return False
 
 
+def _bbox_to_dict(bbox) -> dict:
+    """Convert a Bnd_Box into the min/max/center/dimensions dict"""
+    # One (2, 3) array instead of a dozen scalar ops; the same layout
+    # stacks into an (N, 2, 3) array for whole-assembly reductions
+    arr = np.array(bbox.Get(), dtype=np.float64).reshape(2, 3)
+    mins, maxs = arr[0], arr[1]
+
+    return {
+        "min": mins.tolist(),
+        "max": maxs.tolist(),
+        "center": ((mins + maxs) * 0.5).tolist(),
+        "dimensions": (maxs - mins).tolist()
+    }
+
+
 def get_bounding_box(shape) -> dict:
     """
     Get bounding box dimensions of a shape
-    
+
+    Uses the fast brepbndlib_Add, which may over-estimate slightly on
+    curved faces. That is fine for the Three.js preview this feeds; use
+    get_bounding_box_optimal when an exact fit is required. For
+    CachedShape inputs the result is cached on the wrapper, so repeated
+    preview queries after the first are free.
+
     Args:
-        shape: OpenCascade shape object
-        
+        shape: OpenCascade shape object or CachedShape
+
     Returns:
         dict: Bounding box data with min/max coordinates and center
     """
     try:
+        # Hand out copies of the cached dict: with memoized shapes the
+        # same CachedShape serves many requests, and a caller mutating
+        # its response must not corrupt everyone else's
+        cached = getattr(shape, '_bbox', None)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         bbox = Bnd_Box()
-        brepbndlib_Add(shape, bbox)
-        
-        xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get()
-        
+        brepbndlib_Add(_unwrap(shape), bbox)
+
+        result = _bbox_to_dict(bbox)
+        if isinstance(shape, CachedShape):
+            shape._bbox = copy.deepcopy(result)
+        return result
+    except Exception as e:
+        print(f"Error getting bounding box: {e}")
         return {
-            "min": [xmin, ymin, zmin],
-            "max": [xmax, ymax, zmax],
-            "center": [
-                (xmin + xmax) / 2,
-                (ymin + ymax) / 2,
-                (zmin + zmax) / 2
-            ],
-            "dimensions": [
-                xmax - xmin,
-                ymax - ymin,
-                zmax - zmin
-            ]
+            "min": [0, 0, 0],
+            "max": [0, 0, 0],
+            "center": [0, 0, 0],
+            "dimensions": [0, 0, 0]
         }
+
+
+def get_bounding_box_optimal(shape) -> dict:
+    """
+    Get a tight bounding box of a shape
+
+    Uses brepbndlib_AddOptimal, which fits curved geometry exactly but
+    is noticeably slower than the loose variant in get_bounding_box.
+    Prefer this only when dimensions feed downstream calculations
+    (nesting, packaging, tolerancing) rather than a preview.
+
+    Args:
+        shape: OpenCascade shape object
+
+    Returns:
+        dict: Bounding box data with min/max coordinates and center
+    """
+    try:
+        from OCC.Core.BRepBndLib import brepbndlib_AddOptimal
+
+        bbox = Bnd_Box()
+        brepbndlib_AddOptimal(_unwrap(shape), bbox, False, True)
+
+        return _bbox_to_dict(bbox)
     except Exception as e:
         print(f"Error getting bounding box: {e}")
         return {
@@ -134,42 +374,191 @@ def get_bounding_box(shape) -> dict:
         }
 
 
-def export_all_formats(shape, base_filename: str) -> dict:
+def export_all_formats(shape, base_filename: str,
+                       linear_deflection: float = 0.1,
+                       angular_deflection: float = 0.5) -> dict:
     """
     Export shape to all supported formats
-    
+
+    The shape is tessellated once (in parallel) before the writers are
+    dispatched, so STL export reuses the cached triangulation instead of
+    re-meshing. The three writers then run concurrently: each is
+    disk-bound and releases the GIL inside OCCT's C++ code, so
+    wall-clock time is roughly the slowest single export instead of the
+    sum of all three.
+
     Args:
         shape: OpenCascade shape object
         base_filename: Base filename without extension
-        
+        linear_deflection: Mesh quality for STL (lower = finer mesh)
+        angular_deflection: Angular deflection in radians
+
     Returns:
         dict: Dictionary with file paths and success status
     """
     results = {}
-    
-    # Export STEP
+
     step_file = f"{base_filename}.step"
-    results["step"] = {
-        "file": step_file,
-        "success": export_step(shape, step_file)
-    }
-    
-    # Export STL
     stl_file = f"{base_filename}.stl"
-    results["stl"] = {
-        "file": stl_file,
-        "success": export_stl(shape, stl_file)
-    }
-    
-    # Export BREP
     brep_file = f"{base_filename}.brep"
-    results["brep"] = {
-        "file": brep_file,
-        "success": export_brep(shape, brep_file)
-    }
-    
-    # Get bounding box for preview
-    results["boundingBox"] = get_bounding_box(shape)
-    
+
+    # Create the output directory once up front so the writers don't race
+    # on three separate makedirs calls
+    _ensure_dir(base_filename)
+
+    # Mesh once up front (parallel) so the STL writer doesn't re-tessellate
+    mesh_shape(shape, linear_deflection, angular_deflection)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        f_step = executor.submit(export_step, shape, step_file)
+        f_stl = executor.submit(export_stl, shape, stl_file, mesh=False)
+        f_brep = executor.submit(export_brep, shape, brep_file)
+
+        # Compute the preview bounding box on the main thread while the
+        # writers run
+        results["boundingBox"] = get_bounding_box(shape)
+
+        results["step"] = {"file": step_file, "success": f_step.result()}
+        results["stl"] = {"file": stl_file, "success": f_stl.result()}
+        results["brep"] = {"file": brep_file, "success": f_brep.result()}
+
+    return results
+
+
+def _export_tmp_bytes(write_fn, suffix: str) -> Optional[bytes]:
+    """Run a filename-based writer against a temp file and return the bytes"""
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    try:
+        if not write_fn(tmp_path):
+            return None
+        with open(tmp_path, 'rb') as f:
+            return f.read()
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def export_stl_bytes(shape, linear_deflection: float = 0.1,
+                     angular_deflection: float = 0.5,
+                     mesh: bool = True) -> Optional[bytes]:
+    """
+    Export shape to STL and return the payload as bytes
+
+    Args:
+        shape: OpenCascade shape object
+        linear_deflection: Mesh quality (lower = finer mesh)
+        angular_deflection: Angular deflection in radians
+        mesh: Tessellate before writing; pass False when already meshed
+
+    Returns:
+        bytes: STL file contents, or None on failure
+    """
+    try:
+        if mesh:
+            mesh_shape(shape, linear_deflection, angular_deflection)
+        stl_writer = _get_stl_writer()
+        return _export_tmp_bytes(
+            lambda path: stl_writer.Write(_unwrap(shape), path) is not False,
+            ".stl"
+        )
+    except Exception as e:
+        print(f"Error exporting STL bytes: {e}")
+        return None
+
+
+def export_brep_bytes(shape) -> Optional[bytes]:
+    """
+    Export shape to BREP and return the payload as bytes
+
+    Returns:
+        bytes: BREP file contents, or None on failure
+    """
+    try:
+        return _export_tmp_bytes(
+            lambda path: breptools_Write(_unwrap(shape), path), ".brep"
+        )
+    except Exception as e:
+        print(f"Error exporting BREP bytes: {e}")
+        return None
+
+
+async def export_all_formats_async(shape, base_filename: str,
+                                   linear_deflection: float = 0.1,
+                                   angular_deflection: float = 0.5) -> dict:
+    """
+    Async variant of export_all_formats for event-loop servers
+
+    The OCCT writers run on the default executor so the event loop stays
+    free to serve other requests; concurrent calls are safe because the
+    shared STEP writer serializes under its lock. The resulting bytes
+    are streamed to disk with aiofiles when available, falling back to
+    executor-backed blocking writes when the optional dependency is not
+    installed.
+
+    Args:
+        shape: OpenCascade shape object
+        base_filename: Base filename without extension
+        linear_deflection: Mesh quality for STL (lower = finer mesh)
+        angular_deflection: Angular deflection in radians
+
+    Returns:
+        dict: Dictionary with file paths and success status
+    """
+    try:
+        import aiofiles
+    except ImportError:
+        aiofiles = None
+
+    loop = asyncio.get_running_loop()
+    results = {}
+
+    step_file = f"{base_filename}.step"
+    stl_file = f"{base_filename}.stl"
+    brep_file = f"{base_filename}.brep"
+
+    _ensure_dir(base_filename)
+
+    # Mesh once off-loop, then serialize the three formats concurrently
+    await loop.run_in_executor(
+        None, mesh_shape, shape, linear_deflection, angular_deflection
+    )
+    step_bytes, stl_bytes, brep_bytes = await asyncio.gather(
+        loop.run_in_executor(None, export_step_bytes, shape),
+        loop.run_in_executor(
+            None, lambda: export_stl_bytes(shape, mesh=False)
+        ),
+        loop.run_in_executor(None, export_brep_bytes, shape),
+    )
+
+    def _bwrite(path, data):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    async def _awrite(path, data):
+        if data is None:
+            return False
+        if aiofiles is None:
+            await loop.run_in_executor(None, _bwrite, path, data)
+        else:
+            async with aiofiles.open(path, 'wb') as f:
+                await f.write(data)
+        return True
+
+    step_ok, stl_ok, brep_ok = await asyncio.gather(
+        _awrite(step_file, step_bytes),
+        _awrite(stl_file, stl_bytes),
+        _awrite(brep_file, brep_bytes),
+    )
+
+    results["step"] = {"file": step_file, "success": step_ok}
+    results["stl"] = {"file": stl_file, "success": stl_ok}
+    results["brep"] = {"file": brep_file, "success": brep_ok}
+    results["boundingBox"] = await loop.run_in_executor(
+        None, get_bounding_box, shape
+    )
+
     return results
 
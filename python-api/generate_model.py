@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
 Generate 3D CAD models using PythonOCC
-Usage: python generate_model.py <width> <height> <depth> <output_path>
+Usage: python generate_model.py <width> <height> <depth> <output_path> [--ascii]
 """
 
 import sys
 import os
 
-def generate_model_with_occ(width, height, depth, output_path):
+def generate_model_with_occ(width, height, depth, output_path, ascii_stl=False):
     """Generate model using PythonOCC"""
     try:
         from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox
@@ -26,9 +26,10 @@ def generate_model_with_occ(width, height, depth, output_path):
         step_writer.Write(f"{output_path}.step")
         print(f"✅ STEP: {output_path}.step")
         
-        # Export STL
+        # Export STL (binary by default - ~5x smaller and faster to
+        # write/read than ASCII; pass --ascii if human-readable is needed)
         stl_writer = StlAPI_Writer()
-        stl_writer.SetASCIIMode(True)
+        stl_writer.SetASCIIMode(ascii_stl)
         stl_writer.Write(box_shape, f"{output_path}.stl")
         print(f"✅ STL: {output_path}.stl")
         
@@ -39,12 +40,11 @@ def generate_model_with_occ(width, height, depth, output_path):
         print(f"❌ Error: {e}")
         return False
 
-def generate_model_fallback(width, height, depth, output_path):
-    """Fallback without PythonOCC"""
-    # Simple STEP placeholder
-    step_content = f"""ISO-10303-21;
+# Placeholder STEP payload, assembled once at import; only the
+# dimensions are substituted per request
+_FALLBACK_STEP_TMPL = """ISO-10303-21;
 HEADER;
-FILE_DESCRIPTION(('Box {width}x{height}x{depth}'),'2;1');
+FILE_DESCRIPTION(('Box {w}x{h}x{d}'),'2;1');
 FILE_NAME('box.step','','','','','','');
 FILE_SCHEMA(('AUTOMOTIVE_DESIGN'));
 ENDSEC;
@@ -52,26 +52,33 @@ DATA;
 ENDSEC;
 END-ISO-10303-21;
 """
-    
+
+def generate_model_fallback(width, height, depth, output_path):
+    """Fallback without PythonOCC"""
     with open(f"{output_path}.step", 'w') as f:
-        f.write(step_content)
+        f.write(_FALLBACK_STEP_TMPL.format(w=width, h=height, d=depth))
     
     print(f"⚠️  Using fallback (install PythonOCC for real CAD)")
     print(f"✅ STEP: {output_path}.step")
     return True
 
 if __name__ == "__main__":
-    if len(sys.argv) != 5:
-        print("Usage: python generate_model.py <width> <height> <depth> <output_path>")
+    args = sys.argv[1:]
+    ascii_stl = "--ascii" in args
+    if ascii_stl:
+        args.remove("--ascii")
+
+    if len(args) != 4:
+        print("Usage: python generate_model.py <width> <height> <depth> <output_path> [--ascii]")
         sys.exit(1)
-    
-    width = float(sys.argv[1])
-    height = float(sys.argv[2])
-    depth = float(sys.argv[3])
-    output_path = sys.argv[4]
-    
+
+    width = float(args[0])
+    height = float(args[1])
+    depth = float(args[2])
+    output_path = args[3]
+
     # Try PythonOCC first, fallback if not available
-    success = generate_model_with_occ(width, height, depth, output_path)
+    success = generate_model_with_occ(width, height, depth, output_path, ascii_stl)
     
     if not success:
         success = generate_model_fallback(width, height, depth, output_path)
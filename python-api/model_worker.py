@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Persistent Model Generation Worker
+Keeps PythonOCC loaded and serves generation requests over stdin/stdout
+
+The one-shot CLI scripts pay the multi-second OCC import on every
+invocation. The Node server can instead spawn this worker once at boot
+and pipe it one JSON request per line, getting one JSON response per
+line back:
+
+    {"product": "bottle", "params": {...}, "outputDir": "./output", "modelId": "abc"}
+
+Usage:
+    python model_worker.py
+"""
+
+import sys
+import json
+import os
+import traceback
+from contextlib import redirect_stdout
+
+# Make core/ and products/ importable when run from anywhere
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.exporter import export_all_formats
+from products.box import create_box_cached
+from products.bottle import create_bottle_cached
+
+# Memoized generators: repeated identical requests skip shape creation
+GENERATORS = {
+    "box": create_box_cached,
+    "bottle": create_bottle_cached,
+}
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Generate one model and export all formats
+
+    Returns the same response shape as the one-shot CLI scripts so the
+    Node side can treat both entry points identically.
+    """
+    product = request.get("product", "box")
+    params = request.get("params", {})
+    output_dir = request.get("outputDir", "./output")
+    model_id = request.get("modelId")
+
+    if product not in GENERATORS:
+        return {"success": False, "error": f"Unknown product: {product}"}
+    if not model_id:
+        return {"success": False, "error": "Missing modelId"}
+
+    shape = GENERATORS[product](params)
+
+    base_path = os.path.join(output_dir, model_id)
+    results = export_all_formats(
+        shape, base_path,
+        linear_deflection=float(params.get('linearDeflection', 0.1)),
+        angular_deflection=float(params.get('angularDeflection', 0.5)),
+    )
+
+    return {
+        "success": True,
+        "files": {
+            "step": results["step"]["file"] if results["step"]["success"] else None,
+            "stl": results["stl"]["file"] if results["stl"]["success"] else None,
+            "brep": results["brep"]["file"] if results["brep"]["success"] else None,
+        },
+        "preview": {
+            "boundingBox": results["boundingBox"]
+        },
+        "parameters": params,
+    }
+
+
+def main():
+    """Serve requests until stdin closes"""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"success": False, "error": f"Invalid JSON request: {e}"}
+        else:
+            try:
+                # Generators print progress lines; keep stdout clean for
+                # the JSON-lines protocol by diverting them to stderr
+                with redirect_stdout(sys.stderr):
+                    response = handle_request(request)
+            except Exception as e:
+                response = {
+                    "success": False,
+                    "error": str(e),
+                    "traceback": traceback.format_exc(),
+                }
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,12 @@ Generates a bottle with customizable parameters and exports CAD files
 import sys
 import json
 import argparse
+import functools
 import re
 import os
+from math import tan, radians
+
+import numpy as np
 
 # Add parent directory to path to import core modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,9 +25,70 @@ from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut, BRepAlgoAPI_Fuse
 from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
 from OCC.Core.gp import gp_Pnt, gp_Ax2, gp_Dir, gp_Trsf, gp_Vec
 from OCC.Core.BRepFilletAPI import BRepFilletAPI_MakeFillet
+from OCC.Core.BRepAdaptor import BRepAdaptor_Curve
+from OCC.Core.GeomAbs import GeomAbs_Circle
 from OCC.Core.TopExp import TopExp_Explorer
 from OCC.Core.TopAbs import TopAbs_EDGE
-from core.exporter import export_all_formats
+from OCC.Core.TopTools import TopTools_ListOfShape
+from core.exporter import export_all_formats, CachedShape
+
+# Let OCCT boolean operations use all cores (no-op on builds without TBB)
+try:
+    from OCC.Core.BOPAlgo import BOPAlgo_Options
+    BOPAlgo_Options.SetParallelMode_s(True)
+except Exception:
+    pass
+
+# Optional native rib builder (built manually via build_bottle_ext.sh;
+# see _bottle_ext.cpp). Falls back to the pure-Python rib loop when not
+# compiled. Try the package-relative import first so the extension is
+# found when imported as products.bottle (e.g. by model_worker), then
+# the plain import for direct script runs.
+try:
+    from products import _bottle_ext
+except ImportError:
+    try:
+        import _bottle_ext
+    except ImportError:
+        _bottle_ext = None
+
+
+def _add_ribs_native(bottle, ribs_count, offset, rib_radius, rib_height, z_off):
+    """
+    Fuse all ribs into the bottle inside the native extension
+
+    Exchanges shapes through temp BRep files (two round-trips per call,
+    independent of rib count) so the per-rib work never crosses the
+    Python binding boundary. Returns the fused shape, or None on any
+    failure so the caller can fall back to the Python path.
+    """
+    import tempfile
+    from OCC.Core.BRep import BRep_Builder
+    from OCC.Core.BRepTools import breptools_Read, breptools_Write
+    from OCC.Core.TopoDS import TopoDS_Shape
+
+    fd_in, in_path = tempfile.mkstemp(suffix='.brep')
+    os.close(fd_in)
+    fd_out, out_path = tempfile.mkstemp(suffix='.brep')
+    os.close(fd_out)
+    try:
+        if not breptools_Write(bottle, in_path):
+            return None
+        if not _bottle_ext.add_ribs(in_path, out_path, ribs_count, offset,
+                                    rib_radius, rib_height, z_off):
+            return None
+        result = TopoDS_Shape()
+        if not breptools_Read(result, out_path, BRep_Builder()):
+            return None
+        return result
+    except Exception:
+        return None
+    finally:
+        for path in (in_path, out_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
 
 def create_bottle(params: dict):
@@ -72,7 +137,6 @@ def create_bottle(params: dict):
     body_axis = gp_Ax2(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1))
     body_taper_deg = float(params.get('bodyTaperDeg', 0))
     if body_taper_deg > 0.0:
-        from math import tan, radians
         top_radius = max(0.5, body_radius - body_height * tan(radians(body_taper_deg)))
         outer_body = BRepPrimAPI_MakeCone(body_axis, body_radius, top_radius, body_height).Shape()
         inner_base = max(0.5, body_radius - wall_thickness)
@@ -128,20 +192,51 @@ def create_bottle(params: dict):
         ribs_count = int(params.get('ribsCount', 0) or 0)
         rib_thick = float(params.get('ribThickness', 2))
         if ribs_count > 0 and rib_thick > 0.1:
-            from math import pi
-            angle_step = 2 * pi / ribs_count
             rib_height = max(10.0, body_height * 0.6)
-            for i in range(ribs_count):
-                ang = i * angle_step
-                rib = BRepPrimAPI_MakeCylinder(body_axis, rib_thick, rib_height).Shape()
-                t = gp_Trsf()
-                t.SetTranslation(gp_Vec(body_radius + rib_thick * 0.5, 0, (body_height - rib_height) / 2))
-                rib = BRepBuilderAPI_Transform(rib, t, False).Shape()
-                r2 = gp_Trsf()
-                from OCC.Core.gp import gp_Ax1
-                r2.SetRotation(gp_Ax1(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1)), ang)
-                rib = BRepBuilderAPI_Transform(rib, r2, False).Shape()
-                bottle = BRepAlgoAPI_Fuse(bottle, rib).Shape()
+            offset = body_radius + rib_thick * 0.5
+            z_off = (body_height - rib_height) / 2
+
+            # Prefer the native extension when built: the whole rib loop
+            # and fuse run in one C++ call
+            fused = None
+            if _bottle_ext is not None:
+                fused = _add_ribs_native(bottle, ribs_count, offset,
+                                         rib_thick, rib_height, z_off)
+
+            if fused is not None:
+                bottle = fused
+            else:
+                # Precompute all rib placements as arrays (SoA) in one
+                # vectorized batch. A rib is a cylinder parallel to the body
+                # axis, so translating straight to the rotated offset replaces
+                # the old translate-then-rotate pair of transforms per rib.
+                angs = np.arange(ribs_count) * (2 * np.pi / ribs_count)
+                dx = (np.cos(angs) * offset).tolist()
+                dy = (np.sin(angs) * offset).tolist()
+                # Collect all ribs first, then fuse them into the bottle in a
+                # single boolean operation - fusing one-by-one rebuilds the
+                # ever-growing result N times and dominates runtime for large N
+                ribs = []
+                for x, y in zip(dx, dy):
+                    rib = BRepPrimAPI_MakeCylinder(body_axis, rib_thick, rib_height).Shape()
+                    t = gp_Trsf()
+                    t.SetTranslation(gp_Vec(x, y, z_off))
+                    ribs.append(BRepBuilderAPI_Transform(rib, t, False).Shape())
+
+                args = TopTools_ListOfShape()
+                args.Append(bottle)
+                tools = TopTools_ListOfShape()
+                for rib in ribs:
+                    tools.Append(rib)
+                op = BRepAlgoAPI_Fuse()
+                op.SetArguments(args)
+                op.SetTools(tools)
+                op.SetRunParallel(True)
+                # A small fuzzy tolerance avoids OCCT's retry passes when rib
+                # and body surfaces are tangent within default precision
+                op.SetFuzzyValue(1e-4)
+                op.Build()
+                bottle = op.Shape()
     except Exception:
         pass
 
@@ -150,15 +245,63 @@ def create_bottle(params: dict):
     if fillet_rad > 0.01:
         try:
             mk = BRepFilletAPI_MakeFillet(bottle)
+            # Walk the explorer once, then feed the builder in one tight
+            # pass instead of interleaving traversal and Add calls.
+            # Broad-phase filter: the shoulder fillet only concerns the
+            # circular edges where the neck meets the body, so classify
+            # edges by curve type and center height instead of asking
+            # OCCT to solve fillets on every rib/punt edge too.
+            edges = []
+            shoulder_edges = []
             exp = TopExp_Explorer(bottle, TopAbs_EDGE)
             while exp.More():
-                mk.Add(fillet_rad, exp.Current())
+                edge = exp.Current()
+                edges.append(edge)
+                try:
+                    curve = BRepAdaptor_Curve(edge)
+                    if curve.GetType() == GeomAbs_Circle:
+                        cz = curve.Circle().Location().Z()
+                        if abs(cz - body_height) < wall_thickness:
+                            shoulder_edges.append(edge)
+                except Exception:
+                    pass
                 exp.Next()
+            # Fall back to the global add when classification finds nothing
+            for edge in (shoulder_edges or edges):
+                mk.Add(fillet_rad, edge)
             bottle = mk.Shape()
         except Exception:
             pass
-    
-    return bottle
+
+    # Wrap so downstream bbox queries are computed once and cached;
+    # the booleans above are done, so no invalidation is needed here
+    return CachedShape(bottle)
+
+
+# Each cached entry pins a full B-rep solid (plus triangulation) in
+# memory - ribbed bottles can be several MB each. Tune via env for
+# memory-constrained workers.
+_SHAPE_CACHE_SIZE = int(os.environ.get('SHAPE_CACHE_SIZE', '64'))
+
+
+@functools.lru_cache(maxsize=_SHAPE_CACHE_SIZE)
+def _create_bottle_cached(params_json: str):
+    """Build a bottle from a canonical JSON key (memoized)"""
+    return create_bottle(json.loads(params_json))
+
+
+def create_bottle_cached(params: dict):
+    """
+    Memoized create_bottle for repeated identical requests
+
+    UIs routinely re-request the same parameters (e.g. after a refresh);
+    keying an LRU cache on the canonicalized params skips the whole
+    boolean/fillet pipeline on a hit. The cached shape also keeps its
+    triangulation and bounding box, so repeat exports skip meshing too.
+    Cache size comes from the SHAPE_CACHE_SIZE env var (default 64);
+    each entry holds a full solid in memory.
+    """
+    return _create_bottle_cached(json.dumps(params, sort_keys=True))
 
 
 def main():
@@ -179,12 +322,16 @@ def main():
         return 1
     
     try:
-        # Generate the bottle
-        bottle = create_bottle(params)
+        # Generate the bottle (memoized across identical requests)
+        bottle = create_bottle_cached(params)
         
-        # Export files
+        # Export files (mesh quality tunable per request via params)
         base_path = os.path.join(args.output_dir, args.model_id)
-        results = export_all_formats(bottle, base_path)
+        results = export_all_formats(
+            bottle, base_path,
+            linear_deflection=float(params.get('linearDeflection', 0.1)),
+            angular_deflection=float(params.get('angularDeflection', 0.5)),
+        )
         
         # Build response
         response = {
@@ -7,6 +7,7 @@ Generates a simple box with customizable dimensions and exports CAD files
 import sys
 import json
 import argparse
+import functools
 from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox
 from OCC.Core.STEPControl import STEPControl_Writer, STEPControl_AsIs
 from OCC.Core.StlAPI import StlAPI_Writer
@@ -38,10 +39,32 @@ def create_box(params):
     
     # Create box
     box = BRepPrimAPI_MakeBox(width, height, depth).Shape()
-    
+
     return box
 
 
+# Each cached entry pins a full B-rep solid in memory; tune via env for
+# memory-constrained workers
+_SHAPE_CACHE_SIZE = int(os.environ.get('SHAPE_CACHE_SIZE', '64'))
+
+
+@functools.lru_cache(maxsize=_SHAPE_CACHE_SIZE)
+def _create_box_cached(params_json: str):
+    """Build a box from a canonical JSON key (memoized)"""
+    return create_box(json.loads(params_json))
+
+
+def create_box_cached(params):
+    """
+    Memoized create_box for repeated identical requests
+
+    Keyed on the canonicalized params JSON; a hit returns the cached
+    shape (triangulation included) without rebuilding. Cache size comes
+    from the SHAPE_CACHE_SIZE env var (default 64).
+    """
+    return _create_box_cached(json.dumps(params, sort_keys=True))
+
+
 def export_preview_data(shape):
     """Generate simplified preview data for frontend Three.js"""
     bbox = Bnd_Box()
@@ -72,15 +95,19 @@ def main():
     
     print(f"Generating box with params: {params}")
     
-    # Generate the box
-    box = create_box(params)
+    # Generate the box (memoized across identical requests)
+    box = create_box_cached(params)
     
     # Ensure output directory exists
     os.makedirs(args.output_dir, exist_ok=True)
     
     # Export files (STEP/STL/BREP) via common exporter
     base_path = os.path.join(args.output_dir, args.model_id)
-    results = export_all_formats(box, base_path)
+    results = export_all_formats(
+        box, base_path,
+        linear_deflection=float(params.get('linearDeflection', 0.1)),
+        angular_deflection=float(params.get('angularDeflection', 0.5)),
+    )
     
     # Generate preview data
     preview = export_preview_data(box)
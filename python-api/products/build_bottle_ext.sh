@@ -0,0 +1,20 @@
+#!/usr/bin/env bash
+# Build the optional _bottle_ext native module (manual build only - the
+# pure-Python rib path is always available without it).
+#
+# Needs pybind11 and the OpenCASCADE dev headers from the same conda env
+# that provides pythonocc-core:
+#
+#   conda activate opencascade
+#   pip install pybind11
+#   ./build_bottle_ext.sh
+set -euo pipefail
+cd "$(dirname "$0")"
+
+c++ -O2 -shared -std=c++14 -fPIC $(python -m pybind11 --includes) \
+    -I"$CONDA_PREFIX/include/opencascade" _bottle_ext.cpp \
+    -o _bottle_ext$(python3-config --extension-suffix) \
+    -L"$CONDA_PREFIX/lib" -lTKernel -lTKMath -lTKBRep -lTKG3d \
+    -lTKTopAlgo -lTKPrim -lTKBO
+
+echo "Built _bottle_ext$(python3-config --extension-suffix)"
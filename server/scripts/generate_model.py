@@ -7,35 +7,27 @@ Requirements:
     pip install pythonocc-core
 
 Usage:
-    python generate_model.py <width> <height> <depth> <output_base_path>
+    python generate_model.py <width> <height> <depth> <output_base_path> [--ascii]
 """
 
 import sys
 import os
 
-def generate_model_fallback(width, height, depth, output_path):
-    """
-    Fallback implementation when PythonOCC is not available
-    Creates simple placeholder files
-    """
-    print(f"⚠️ PythonOCC not available. Creating placeholder files.")
-    print(f"📦 Model parameters: {width}x{height}x{depth}")
-    
-    # Create a simple STEP placeholder
-    step_content = f"""ISO-10303-21;
+# Placeholder payloads for the no-PythonOCC fallback, assembled once at
+# import; only the three dimensions are substituted per request
+_FALLBACK_STEP_TMPL = """ISO-10303-21;
 HEADER;
 FILE_DESCRIPTION(('Parametric Box Model - Placeholder'),'2;1');
 FILE_NAME('model.step','', (''), (''), 'pythonocc-generator', '', '');
 FILE_SCHEMA(('AUTOMOTIVE_DESIGN'));
 ENDSEC;
 DATA;
-/* Box dimensions: {width}x{height}x{depth} */
+/* Box dimensions: {w}x{h}x{d} */
 ENDSEC;
 END-ISO-10303-21;
 """
-    
-    # Create a simple DXF placeholder
-    dxf_content = f"""0
+
+_FALLBACK_DXF_TMPL = """0
 SECTION
 2
 HEADER
@@ -62,19 +54,30 @@ TEXT
 40
 5.0
 1
-Dimensions: {width}x{height}x{depth}
+Dimensions: {w}x{h}x{d}
 0
 ENDSEC
 0
 EOF
 """
-    
+
+def generate_model_fallback(width, height, depth, output_path):
+    """
+    Fallback implementation when PythonOCC is not available
+    Creates simple placeholder files
+    """
+    print(f"⚠️ PythonOCC not available. Creating placeholder files.")
+    print(f"📦 Model parameters: {width}x{height}x{depth}")
+
+    step_content = _FALLBACK_STEP_TMPL.format(w=width, h=height, d=depth)
+    dxf_content = _FALLBACK_DXF_TMPL.format(w=width, h=height, d=depth)
+
     try:
-        with open(f"{output_path}.step", 'w') as f:
+        with open(f"{output_path}.step", 'w', buffering=1024 * 1024) as f:
             f.write(step_content)
         print(f"✅ Created: {output_path}.step")
-        
-        with open(f"{output_path}.dxf", 'w') as f:
+
+        with open(f"{output_path}.dxf", 'w', buffering=1024 * 1024) as f:
             f.write(dxf_content)
         print(f"✅ Created: {output_path}.dxf")
         
@@ -83,7 +86,7 @@ EOF
         print(f"❌ Error creating files: {e}")
         return False
 
-def generate_model_with_occ(width, height, depth, output_path):
+def generate_model_with_occ(width, height, depth, output_path, ascii_stl=False):
     """
     Generate model using PythonOCC
     """
@@ -112,9 +115,10 @@ def generate_model_with_occ(width, height, depth, output_path):
         else:
             print(f"⚠️ STEP export warning: status={status}")
         
-        # Export to STL
+        # Export to STL (binary by default - ~5x smaller and faster to
+        # write/read than ASCII; pass --ascii if human-readable is needed)
         stl_writer = StlAPI_Writer()
-        stl_writer.SetASCIIMode(True)
+        stl_writer.SetASCIIMode(ascii_stl)
         stl_writer.Write(box_shape, f"{output_path}.stl")
         print(f"✅ STL file created: {output_path}.stl")
         
@@ -145,7 +149,10 @@ def generate_dxf_projection(width, height, depth, output_file):
     """
     Generate 2D DXF projection views
     """
-    dxf_content = f"""0
+    # Accumulate sections in a list and join once - repeated += on a
+    # string reallocates the whole buffer each time
+    parts = []
+    parts.append("""0
 SECTION
 2
 HEADER
@@ -185,11 +192,11 @@ ENDSEC
 SECTION
 2
 ENTITIES
-"""
-    
+""")
+
     # Front view (centered at origin)
     w, h = width, height
-    dxf_content += f"""0
+    parts.append(f"""0
 LINE
 8
 0
@@ -237,10 +244,10 @@ LINE
 {-w/2}
 21
 {-h/2}
-"""
-    
+""")
+
     # Dimension text
-    dxf_content += f"""0
+    parts.append(f"""0
 TEXT
 8
 0
@@ -252,35 +259,41 @@ TEXT
 5
 1
 W:{width} H:{height} D:{depth}
-"""
-    
-    dxf_content += """0
+""")
+
+    parts.append("""0
 ENDSEC
 0
 EOF
-"""
-    
-    with open(output_file, 'w') as f:
-        f.write(dxf_content)
+""")
+
+    # Large buffer so the joined content flushes in a single write()
+    with open(output_file, 'w', buffering=1024 * 1024) as f:
+        f.write("".join(parts))
     print(f"✅ DXF file created: {output_file}")
 
 def main():
-    if len(sys.argv) != 5:
-        print("Usage: python generate_model.py <width> <height> <depth> <output_path>")
+    args = sys.argv[1:]
+    ascii_stl = "--ascii" in args
+    if ascii_stl:
+        args.remove("--ascii")
+
+    if len(args) != 4:
+        print("Usage: python generate_model.py <width> <height> <depth> <output_path> [--ascii]")
         sys.exit(1)
-    
+
     try:
-        width = float(sys.argv[1])
-        height = float(sys.argv[2])
-        depth = float(sys.argv[3])
-        output_path = sys.argv[4]
-        
+        width = float(args[0])
+        height = float(args[1])
+        depth = float(args[2])
+        output_path = args[3]
+
         print(f"=" * 60)
         print(f"PythonOCC Model Generator")
         print(f"=" * 60)
         
         # Try to generate with PythonOCC first
-        success = generate_model_with_occ(width, height, depth, output_path)
+        success = generate_model_with_occ(width, height, depth, output_path, ascii_stl)
         
         # Fallback if PythonOCC is not available
         if not success: